@@ -1,5 +1,74 @@
 import sqlite3
 
+# An expense is flagged as an outlier when it lies this many standard
+# deviations above the running mean of its category.
+OUTLIER_Z_SCORE = 3.0
+
+# Minimum number of prior expenses in a category before outliers are flagged.
+OUTLIER_MIN_SAMPLES = 5
+
+
+def _create_schema(cursor):
+    """
+    Create all application tables that do not exist yet.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS expenses (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL,
+            description TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS income (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL,
+            description TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS budgets (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            budget REAL NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY,
+            goal_name TEXT NOT NULL,
+            target_amount REAL NOT NULL,
+            current_amount REAL DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS category_stats (
+            category TEXT PRIMARY KEY,
+            expense_count INTEGER NOT NULL,
+            mean REAL NOT NULL,
+            m2 REAL NOT NULL,
+            total_spent REAL NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS alerts (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            expense_id INTEGER,
+            alert_type TEXT NOT NULL,
+            amount REAL NOT NULL,
+            message TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
 
 def create_tables():
     """
@@ -10,45 +79,27 @@ def create_tables():
         - **income**: Stores income records.
         - **budgets**: Stores budget records for specific categories.
         - **goals**: Stores financial goal records.
+        - **category_stats**: Stores running spending statistics per category.
+        - **alerts**: Stores budget-overrun and spending anomaly alerts.
     """
     try:
         connection = sqlite3.connect("budget_tracker.db")
         cursor = connection.cursor()
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY,
-                category TEXT NOT NULL,
-                amount REAL NOT NULL,
-                description TEXT
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS income (
-                id INTEGER PRIMARY KEY,
-                category TEXT NOT NULL,
-                amount REAL NOT NULL,
-                description TEXT
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS budgets (
-                id INTEGER PRIMARY KEY,
-                category TEXT NOT NULL,
-                budget REAL NOT NULL
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY,
-                goal_name TEXT NOT NULL,
-                target_amount REAL NOT NULL,
-                current_amount REAL DEFAULT 0
-            )
-        """)
+        _create_schema(cursor)
+
+        # Seed the statistics from existing expenses when upgrading a database
+        cursor.execute("SELECT 1 FROM category_stats LIMIT 1")
+        if cursor.fetchone() is None:
+            _compute_category_stats(cursor)
+            cursor.execute("""
+                SELECT s.category, s.total_spent, b.budget
+                FROM category_stats s
+                JOIN budgets b ON b.category = s.category
+                WHERE s.total_spent > b.budget
+            """)
+            for category, total_spent, budget in cursor.fetchall():
+                _record_budget_alert(cursor, category, None, total_spent, budget)
 
         connection.commit()
     except sqlite3.Error as e:
@@ -66,6 +117,209 @@ def connect_db():
     return sqlite3.connect("budget_tracker.db")
 
 
+def _welford_add(count, mean, m2, amount):
+    """
+    Add an amount to running statistics using Welford's algorithm.
+
+    :return: The updated `(count, mean, m2)` tuple.
+
+    >>> stats = (0, 0.0, 0.0)
+    >>> for amount in [10.0, 12.0, 11.0]:
+    ...     stats = _welford_add(*stats, amount)
+    >>> stats
+    (3, 11.0, 2.0)
+    """
+    count += 1
+    delta = amount - mean
+    mean += delta / count
+    m2 += delta * (amount - mean)
+    return count, mean, m2
+
+
+def _welford_remove(count, mean, m2, amount):
+    """
+    Remove an amount from running statistics by reversing Welford's algorithm.
+
+    :return: The updated `(count, mean, m2)` tuple.
+
+    Removing an amount gives the statistics of the remaining amounts:
+
+    >>> _welford_remove(3, 11.0, 2.0, 12.0)
+    (2, 10.5, 0.5)
+    >>> _welford_remove(1, 10.0, 0.0, 10.0)
+    (0, 0.0, 0.0)
+    """
+    if count <= 1:
+        return 0, 0.0, 0.0
+    new_count = count - 1
+    new_mean = (count * mean - amount) / new_count
+    m2 -= (amount - mean) * (amount - new_mean)
+    return new_count, new_mean, max(0.0, m2)
+
+
+def record_alert(cursor, category, expense_id, alert_type, amount, message):
+    """
+    Store an alert in the `alerts` table and print it to the user.
+    """
+    cursor.execute(
+        "INSERT INTO alerts (category, expense_id, alert_type, amount, message) VALUES (?, ?, ?, ?, ?)",
+        (category, expense_id, alert_type, amount, message),
+    )
+    print(f"ALERT: {message}")
+
+
+def _record_budget_alert(cursor, category, expense_id, total_spent, budget):
+    """
+    Store a `budget_exceeded` alert for a category that is over its budget.
+    """
+    record_alert(
+        cursor,
+        category,
+        expense_id,
+        "budget_exceeded",
+        total_spent,
+        f"Spending in '{category}' ({total_spent:.2f}) has exceeded its budget of {budget:.2f}.",
+    )
+
+
+def update_category_stats(cursor, category, expense_id, old_amount=None, new_amount=None):
+    """
+    Update the running statistics of a category after an expense change.
+
+    Handles inserts (`old_amount` is None), updates (both amounts given)
+    and deletions (`new_amount` is None) in constant time, without scanning
+    the `expenses` table.
+
+    Alerts emitted:
+        - **outlier**: The new amount is more than `OUTLIER_Z_SCORE` standard
+          deviations above the category mean.
+        - **budget_exceeded**: Total spending in the category crosses its budget.
+    """
+    cursor.execute(
+        "SELECT expense_count, mean, m2, total_spent FROM category_stats WHERE category = ?",
+        (category,),
+    )
+    row = cursor.fetchone()
+    count, mean, m2, total_spent = row if row else (0, 0.0, 0.0, 0.0)
+    previous_total = total_spent
+
+    if old_amount is not None:
+        count, mean, m2 = _welford_remove(count, mean, m2, old_amount)
+        total_spent -= old_amount
+
+    if new_amount is not None:
+        # Compare against the statistics of the other expenses in the category
+        if count >= OUTLIER_MIN_SAMPLES:
+            std_dev = (m2 / (count - 1)) ** 0.5
+            if std_dev > 0 and new_amount > mean + OUTLIER_Z_SCORE * std_dev:
+                record_alert(
+                    cursor,
+                    category,
+                    expense_id,
+                    "outlier",
+                    new_amount,
+                    f"Unusually large expense of {new_amount:.2f} in '{category}' "
+                    f"(average: {mean:.2f}, std dev: {std_dev:.2f}).",
+                )
+        count, mean, m2 = _welford_add(count, mean, m2, new_amount)
+        total_spent += new_amount
+
+    if count == 0:
+        cursor.execute("DELETE FROM category_stats WHERE category = ?", (category,))
+    else:
+        cursor.execute(
+            "INSERT OR REPLACE INTO category_stats (category, expense_count, mean, m2, total_spent) VALUES (?, ?, ?, ?, ?)",
+            (category, count, mean, m2, total_spent),
+        )
+
+    cursor.execute("SELECT budget FROM budgets WHERE category = ?", (category,))
+    budget = cursor.fetchone()
+    if budget and previous_total <= budget[0] < total_spent:
+        _record_budget_alert(cursor, category, expense_id, total_spent, budget[0])
+
+
+def _compute_category_stats(cursor):
+    """
+    Recompute the `category_stats` table from the `expenses` table.
+
+    Uses a single set-based aggregate query over the expense history.
+
+    :return: The number of categories with statistics.
+    """
+    cursor.execute("DELETE FROM category_stats")
+    cursor.execute("""
+        INSERT INTO category_stats (category, expense_count, mean, m2, total_spent)
+        SELECT e.category,
+               COUNT(*),
+               s.mean,
+               SUM((e.amount - s.mean) * (e.amount - s.mean)),
+               SUM(e.amount)
+        FROM expenses e
+        JOIN (
+            SELECT category, AVG(amount) AS mean FROM expenses GROUP BY category
+        ) s ON s.category = e.category
+        GROUP BY e.category
+    """)
+    return cursor.rowcount
+
+
+def rebuild_category_stats():
+    """
+    Recompute the running statistics of every category from the `expenses` table.
+
+    Useful for repairing the statistics after the database has been edited
+    outside the application. No alerts are emitted during a rebuild.
+    """
+    try:
+        connection = connect_db()
+        cursor = connection.cursor()
+        category_count = _compute_category_stats(cursor)
+        connection.commit()
+        print(f"Spending statistics rebuilt for {category_count} categories.")
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+    finally:
+        connection.close()
+
+
+def view_alerts():
+    """
+    Display all budget-overrun and spending anomaly alerts.
+
+    Features:
+        - View all alerts, most recent first.
+        - Clear all alerts.
+    """
+    try:
+        connection = connect_db()
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT id, created_at, alert_type, category, message FROM alerts ORDER BY id DESC"
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            print("No alerts found.")
+            return
+
+        print("Alerts:")
+        for row in rows:
+            print(
+                f"ID: {row[0]}, Date: {row[1]}, Type: {row[2]}, Category: {row[3]}, Message: {row[4]}"
+            )
+
+        choice = input("Do you want to (C)lear all alerts or (Q)uit? ").lower()
+        if choice == "c":
+            cursor.execute("DELETE FROM alerts")
+            connection.commit()
+            print("All alerts cleared successfully!")
+        elif choice == "q":
+            print("Returning to the main menu.")
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+    finally:
+        connection.close()
+
+
 def add_expense():
     """
     Add a new expense to the database.
@@ -75,7 +329,8 @@ def add_expense():
         - **amount**: The amount of the expense.
         - **description**: (Optional) A description of the expense.
 
-    Adds the expense record to the `expenses` table.
+    Adds the expense record to the `expenses` table and checks it against
+    the category's budget and running statistics.
     """
     try:
         connection = connect_db()
@@ -89,6 +344,7 @@ def add_expense():
             "INSERT INTO expenses (category, amount, description) VALUES (?, ?, ?)",
             (category, amount, description),
         )
+        update_category_stats(cursor, category, cursor.lastrowid, new_amount=amount)
         connection.commit()
         print("Expense added successfully!")
     except ValueError:
@@ -129,10 +385,22 @@ def view_expenses():
         if choice == "u":
             expense_id = int(input("Enter the ID of the expense to update: "))
             new_amount = float(input("Enter the new amount: "))
+            cursor.execute(
+                "SELECT category, amount FROM expenses WHERE id = ?", (expense_id,)
+            )
+            expense_details = cursor.fetchone()
             cursor.execute(
                 "UPDATE expenses SET amount = ? WHERE id = ?",
                 (new_amount, expense_id),
             )
+            if expense_details:
+                update_category_stats(
+                    cursor,
+                    expense_details[0],
+                    expense_id,
+                    old_amount=expense_details[1],
+                    new_amount=new_amount,
+                )
             connection.commit()
             print("Expense amount updated successfully!")
         elif choice == "d":
@@ -149,6 +417,9 @@ def view_expenses():
 
                 # Delete the expense
                 cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+                update_category_stats(
+                    cursor, expense_category, expense_id, old_amount=expense_amount
+                )
                 connection.commit()
                 print("Expense deleted successfully!")
 
@@ -213,10 +484,22 @@ def view_expenses_by_category():
         if choice == "u":
             expense_id = int(input("Enter the ID of the expense to update: "))
             new_amount = float(input("Enter the new amount: "))
+            cursor.execute(
+                "SELECT category, amount FROM expenses WHERE id = ?", (expense_id,)
+            )
+            expense_details = cursor.fetchone()
             cursor.execute(
                 "UPDATE expenses SET amount = ? WHERE id = ?",
                 (new_amount, expense_id),
             )
+            if expense_details:
+                update_category_stats(
+                    cursor,
+                    expense_details[0],
+                    expense_id,
+                    old_amount=expense_details[1],
+                    new_amount=new_amount,
+                )
             connection.commit()
             print("Expense amount updated successfully!")
         elif choice == "d":
@@ -233,6 +516,9 @@ def view_expenses_by_category():
 
                 # Delete the expense
                 cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+                update_category_stats(
+                    cursor, expense_category, expense_id, old_amount=expense_amount
+                )
                 connection.commit()
                 print("Expense deleted successfully!")
 
@@ -383,6 +669,7 @@ def set_budget():
 
     If the category exists, updates the budget amount.
     Otherwise, creates a new budget record for the category.
+    Raises a budget alert if the new budget puts the category's spending over it.
     """
     try:
         connection = connect_db()
@@ -391,7 +678,9 @@ def set_budget():
         budget = float(input("Enter budget amount: "))
 
         # Check if category exists
-        cursor.execute("SELECT id FROM budgets WHERE category = ?", (category,))
+        cursor.execute(
+            "SELECT id, budget FROM budgets WHERE category = ?", (category,)
+        )
         existing_record = cursor.fetchone()
 
         if existing_record:
@@ -406,6 +695,15 @@ def set_budget():
                 (category, budget),
             )
 
+        cursor.execute(
+            "SELECT total_spent FROM category_stats WHERE category = ?", (category,)
+        )
+        stats = cursor.fetchone()
+        # Only alert when the new budget is what puts the category over it
+        was_over_budget = existing_record and stats and stats[0] > existing_record[1]
+        if stats and stats[0] > budget and not was_over_budget:
+            _record_budget_alert(cursor, category, None, stats[0], budget)
+
         connection.commit()
         print("Budget set successfully!")
     except ValueError:
@@ -540,6 +838,9 @@ def view_financial_goal_progress():
                 "INSERT INTO expenses (category, amount, description) VALUES (?, ?, ?)",
                 (goal_name, contribution_amount, "Contribution to financial goal"),
             )
+            update_category_stats(
+                cursor, goal_name, cursor.lastrowid, new_amount=contribution_amount
+            )
             connection.commit()
             print("Contribution added successfully and logged as an expense!")
 
@@ -575,6 +876,10 @@ def view_financial_goal_progress():
                         cursor.execute(
                             "DELETE FROM expenses WHERE category = ?", (goal_name,)
                         )
+                        cursor.execute(
+                            "DELETE FROM category_stats WHERE category = ?",
+                            (goal_name,),
+                        )
                         connection.commit()
                         print(
                             f"All expenses related to '{goal_name}' have been deleted."
@@ -617,7 +922,9 @@ def main_menu():
         8. View budget for a category
         9. Set financial goals
         10. View progress towards financial goals
-        11. Quit
+        11. View alerts
+        12. Rebuild spending statistics
+        13. Quit
         """)
         choice = input("Enter your choice: ")
 
@@ -642,10 +949,15 @@ def main_menu():
         elif choice == "10":
             view_financial_goal_progress()
         elif choice == "11":
+            view_alerts()
+        elif choice == "12":
+            rebuild_category_stats()
+        elif choice == "13":
             print("Exiting the program. Goodbye!")
             break
         else:
             print("Invalid choice. Please try again.")
 
 
-main_menu()
+if __name__ == "__main__":
+    main_menu()